@@ -1,16 +1,47 @@
 # ============================== IMPORTS ============================== #
+from __future__ import annotations
+
+import time
+_startup_begin = time.perf_counter()
+
 import os
+import sys
+import json
+import math
+import hmac
 import hashlib
-import time
 import threading
-import requests
+import importlib
 import urllib.parse
-from telegram import Update
-from telegram.ext import ApplicationBuilder, CommandHandler, ContextTypes
+import collections
+import functools
+import concurrent.futures
+from typing import TYPE_CHECKING
 import datetime
 import pytz
 import asyncio
 
+if TYPE_CHECKING:
+    from telegram import Update
+    from telegram.ext import ContextTypes
+
+
+class _LazyModule:
+    """Imports a module on first attribute access, keeping it off the startup path."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+# telegram is imported in main(); requests on the first API call
+requests = _LazyModule("requests")
+
 # ============================== CONFIGURATION ============================== #
 try:
     from config import (
@@ -28,6 +59,9 @@ except ImportError:
     DESS_DEVADDR = os.environ.get("DESS_DEVADDR")
     DESS_DEVICE_SN = os.environ.get("DESS_DEVICE_SN")
 
+# Language for user-facing messages ('ar' or 'en')
+BOT_LANGUAGE = os.environ.get("BOT_LANGUAGE", "ar")
+
 # Set timezone to Damascus (Syria)
 TIMEZONE = pytz.timezone('Asia/Damascus')
 
@@ -37,20 +71,134 @@ FRIDGE_ACTIVATION_THRESHOLD = 65
 FRIDGE_WARNING_THRESHOLD = 68
 POWER_THRESHOLDS = (500, 850)
 
+# Extra metrics to extract beyond the core ones, e.g. METRICS="pv_power,battery_voltage"
+METRIC_SUBSCRIPTIONS = [m.strip() for m in os.environ.get("METRICS", "").split(",") if m.strip()]
+# Threshold alerts on any metric, e.g. {'metric': 'inverter_temperature', 'above': 60}
+METRIC_ALERTS = []
+METRIC_HISTORY_SIZE = 8640       # Readings kept per metric (24h at the 10s poll interval)
+CHART_WIDTH = 24                 # Characters in a /chart sparkline
+
+# Circuit breaker around the DessMonitor API
+CIRCUIT_FAILURE_THRESHOLD = 5    # Consecutive failed queries before the circuit opens
+CIRCUIT_RECOVERY_TIMEOUT = 60    # Seconds to fail fast before letting a probe through
+
+# Hedged requests (send a second request if the first is slower than usual)
+HEDGE_REQUESTS = os.environ.get("DESS_HEDGE_REQUESTS", "0") == "1"
+HEDGE_MIN_SAMPLES = 20           # Latency samples needed before hedging kicks in
+HEDGE_MIN_DELAY = 0.5            # Never hedge sooner than this (seconds)
+
+# Monitoring job scheduling
+CHECK_INTERVAL = 10              # Seconds between monitoring ticks
+CHECK_DEADLINE = 25              # Seconds a tick may wait on the upstream before giving up
+UPSTREAM_MAX_WORKERS = 4         # Threads reserved for DessMonitor I/O
+
 # Global variables
-last_power_usage = None
-last_electricity_time = None
-electricity_start_time = None
-electricity_duration = None
-fridge_warning_sent = False
 admin_chat_id = None
 api_failure_notified = False
 last_api_failure_time = None
 consecutive_failures = 0
 
+# Startup and profiling
+STARTUP_BUDGET_MS = int(os.environ.get("STARTUP_BUDGET_MS", "1000"))
+PROFILE_ON_START = int(os.environ.get("PROFILE_ON_START", "0"))  # Seconds to profile once monitoring starts (0 = off)
+PROFILE_DEFAULT_SECONDS = 30
+PROFILE_MAX_SECONDS = 300
+PROFILE_SAMPLE_INTERVAL = 0.01   # Seconds between stack samples
+PROFILE_TOP_N = 10
+TELEGRAM_MESSAGE_LIMIT = 4096    # Max characters in one Telegram message
+# Chats allowed to use admin commands such as /profile (empty = admin commands disabled)
+ADMIN_CHAT_IDS = {int(c) for c in os.environ.get("ADMIN_CHAT_IDS", "").split(",") if c.strip()}
+
+# Admin HTTP API (disabled unless ADMIN_API_TOKEN is set)
+ADMIN_API_TOKEN = os.environ.get("ADMIN_API_TOKEN")
+ADMIN_API_HOST = os.environ.get("ADMIN_API_HOST", "0.0.0.0")
+ADMIN_API_PORT = int(os.environ.get("ADMIN_API_PORT") or os.environ.get("PORT") or "8080")
+
+# Append every parsed reading to this JSON-lines file for `python main.py replay`
+RECORD_READINGS = os.environ.get("RECORD_READINGS")
+
 # Legacy fallback URL (for /update_api command)
 LEGACY_API_URL = None
 
+# Dedicated bounded pool for upstream I/O so slow API calls can't starve the default executor
+upstream_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=UPSTREAM_MAX_WORKERS, thread_name_prefix="dess-upstream"
+)
+_inflight_fetch = None  # Shared get_system_data call, merged across overlapping callers
+
+# Per-job run statistics, keyed by job name
+job_stats = {}
+
+
+# ============================== CIRCUIT BREAKER ============================== #
+class CircuitBreaker:
+    """Fails fast while the upstream is down instead of tying up threads on timeouts.
+
+    closed    -> requests pass through; consecutive failures are counted
+    open      -> requests are rejected until the recovery timeout elapses
+    half_open -> a single probe request is allowed; success closes, failure re-opens
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=CIRCUIT_FAILURE_THRESHOLD, recovery_timeout=CIRCUIT_RECOVERY_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """Return True if a request may be sent now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.time() - self.opened_at < self.recovery_timeout:
+                    return False
+                print("🟡 Circuit half-open, probing DessMonitor API...")
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            # Half-open: only one probe at a time
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                print("🟢 Circuit closed, DessMonitor API recovered")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"🔴 Circuit open after {self.failures} failures, failing fast for {self.recovery_timeout}s")
+                self.state = self.OPEN
+                self.opened_at = time.time()
+
+    def reset(self):
+        """Force the circuit closed (e.g. after a manual re-auth)."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def is_closed(self):
+        """False while open or half-open, i.e. whenever allow_request may reject callers."""
+        with self._lock:
+            return self.state == self.CLOSED
+
 
 # ============================== DESSMONITOR API CLIENT ============================== #
 class DessMonitorAPI:
@@ -70,9 +218,16 @@ class DessMonitorAPI:
         self.secret = None
         self.token = None
         self.token_expiry = 0
+        self.token_issued_at = 0
         self._lock = threading.Lock()
         self._auth_variant = 1  # Which sign variant worked for auth
 
+        self.breaker = CircuitBreaker()
+        self.stats = {'queries': 0, 'failures': 0, 'rejected': 0}
+        self.hedge_requests = HEDGE_REQUESTS
+        self._latencies = collections.deque(maxlen=200)  # Recent query latencies (seconds)
+        self._hedge_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="dess-hedge")
+
     def _sha1(self, text):
         """Compute SHA-1 hash and return lowercase hex string."""
         return hashlib.sha1(text.encode('utf-8')).hexdigest()
@@ -125,6 +280,7 @@ class DessMonitorAPI:
                     self.token = data['dat']['token']
                     expire_seconds = data['dat'].get('expire', 432000)
                     self.token_expiry = time.time() + expire_seconds
+                    self.token_issued_at = time.time()
                     hours = expire_seconds / 3600
                     print(f"✅ Auth successful. Token valid for {hours:.0f} hours")
                     return True
@@ -161,6 +317,7 @@ class DessMonitorAPI:
                     self.token = data['dat']['token']
                     expire_seconds = data['dat'].get('expire', 432000)
                     self.token_expiry = time.time() + expire_seconds
+                    self.token_issued_at = time.time()
                     hours = expire_seconds / 3600
                     print(f"✅ Token refreshed. Valid for {hours:.0f} hours")
                     return True
@@ -183,12 +340,79 @@ class DessMonitorAPI:
                 return self.refresh_token()
             return True
 
+    def _timed_get(self, url):
+        """GET a URL and record its latency for hedge-delay estimation."""
+        start = time.monotonic()
+        response = requests.get(url, timeout=15)
+        self._latencies.append(time.monotonic() - start)
+        return response
+
+    def latency_p95(self):
+        """95th percentile of recent query latencies in seconds, or None without samples."""
+        samples = sorted(self._latencies)
+        if not samples:
+            return None
+        return samples[max(int(len(samples) * 0.95) - 1, 0)]
+
+    def _hedge_delay(self):
+        """Delay before sending a hedged request: the p95 of recent latencies."""
+        return max(self.latency_p95(), HEDGE_MIN_DELAY)
+
+    def _send(self, build_url):
+        """Send a query, hedging with a second request if the first is slower than p95.
+
+        build_url is called per request so each one carries its own salt and sign.
+        """
+        if not self.hedge_requests or len(self._latencies) < HEDGE_MIN_SAMPLES:
+            return self._timed_get(build_url())
+
+        delay = self._hedge_delay()
+        primary = self._hedge_pool.submit(self._timed_get, build_url())
+        try:
+            return primary.result(timeout=delay)
+        except concurrent.futures.TimeoutError:
+            pass
+
+        print(f"🔀 Request slower than {delay:.2f}s, sending hedged request...")
+        hedge = self._hedge_pool.submit(self._timed_get, build_url())
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _build_query_url(self, action_string):
+        salt = self._get_salt()
+        sign = self._sha1(salt + self.secret + self.token + action_string)
+        return self._build_url(sign, salt, self.token, action_string)
+
     def query_device_data(self):
-        """Fetch device parameters via queryDeviceParsEs. Returns raw API response or None."""
+        """Fetch device parameters via queryDeviceParsEs. Returns raw API response or None.
+
+        Guarded by the circuit breaker: while it is open this returns None immediately.
+        """
+        if not self.breaker.allow_request():
+            print("⛔ Circuit breaker rejected DessMonitor API request")
+            self.stats['rejected'] += 1
+            return None
+
+        self.stats['queries'] += 1
+        data = self._query_device_data()
+        if data:
+            self.breaker.record_success()
+        else:
+            self.stats['failures'] += 1
+            self.breaker.record_failure()
+        return data
+
+    def _query_device_data(self):
         if not self.ensure_token():
             return None
 
-        salt = self._get_salt()
         action_string = (
             f"&action=queryDeviceParsEs"
             f"&source=1"
@@ -198,11 +422,9 @@ class DessMonitorAPI:
             f"&sn={self.device_sn}"
             f"&i18n=en_US"
         )
-        sign = self._sha1(salt + self.secret + self.token + action_string)
-        url = self._build_url(sign, salt, self.token, action_string)
 
         try:
-            response = requests.get(url, timeout=15)
+            response = self._send(lambda: self._build_query_url(action_string))
             if response.status_code == 200:
                 data = response.json()
                 if data.get('err') == 0:
@@ -216,10 +438,7 @@ class DessMonitorAPI:
                         with self._lock:
                             if self.authenticate():
                                 # Retry with fresh token
-                                salt = self._get_salt()
-                                sign = self._sha1(salt + self.secret + self.token + action_string)
-                                url = self._build_url(sign, salt, self.token, action_string)
-                                response = requests.get(url, timeout=15)
+                                response = self._send(lambda: self._build_query_url(action_string))
                                 if response.status_code == 200:
                                     data = response.json()
                                     if data.get('err') == 0:
@@ -239,19 +458,340 @@ class DessMonitorAPI:
 
 # ============================== INITIALIZE API CLIENT ============================== #
 dess_api = None
-if DESS_USERNAME and DESS_PASSWORD and DESS_COMPANY_KEY:
-    dess_api = DessMonitorAPI(
-        username=DESS_USERNAME,
-        password=DESS_PASSWORD,
-        company_key=DESS_COMPANY_KEY,
-        device_pn=DESS_DEVICE_PN or "W0040157841922",
-        devcode=DESS_DEVCODE or "2451",
-        devaddr=DESS_DEVADDR or "1",
-        device_sn=DESS_DEVICE_SN or "96322407504037",
-    )
-    print("✅ DessMonitor API client initialized with credentials")
-else:
-    print("⚠️ DessMonitor credentials not found. Falling back to legacy URL mode.")
+
+
+def init_dess_api():
+    """Build the API client from the configured credentials. Called from main()
+    rather than at import so importing this module stays cheap."""
+    global dess_api
+    if DESS_USERNAME and DESS_PASSWORD and DESS_COMPANY_KEY:
+        dess_api = DessMonitorAPI(
+            username=DESS_USERNAME,
+            password=DESS_PASSWORD,
+            company_key=DESS_COMPANY_KEY,
+            device_pn=DESS_DEVICE_PN or "W0040157841922",
+            devcode=DESS_DEVCODE or "2451",
+            devaddr=DESS_DEVADDR or "1",
+            device_sn=DESS_DEVICE_SN or "96322407504037",
+        )
+        print("✅ DessMonitor API client initialized with credentials")
+    else:
+        print("⚠️ DessMonitor credentials not found. Falling back to legacy URL mode.")
+
+
+# ============================== MESSAGE TEMPLATES ============================== #
+# Per-language bundles. Alert logic only ever refers to template keys, so adding a
+# language means adding a bundle here and a pluralization rule below.
+MESSAGES = {
+    'ar': {
+        'start': (
+            "مرحباً بك في بوت مراقبة نظام الطاقة! 🔋\n\n"
+            "وضع الاتصال: {auth_status}\n\n"
+            "الأوامر المتاحة:\n"
+            "/battery - عرض حالة النظام وبدء المراقبة التلقائية\n"
+            "/stop - إيقاف المراقبة التلقائية\n"
+            "/chart - رسم بياني لأحد المقاييس\n"
+            "/reauth - إعادة المصادقة يدوياً\n"
+            "/update_api - تحديث عنوان API (الوضع اليدوي القديم)"
+        ),
+        'auth_mode_api': "✅ مصادقة تلقائية (API)",
+        'auth_mode_url': "⚠️ وضع URL اليدوي",
+        'loading': "⏳ جاري الحصول على البيانات...",
+        'fetch_failed': "⚠️ تعذر الحصول على البيانات. تحقق من السجلات أو جرّب /reauth",
+        'monitoring_stopped': "✅ تم إيقاف المراقبة التلقائية بنجاح.",
+        'monitoring_not_active': "❌ المراقبة التلقائية غير مفعلة حالياً.",
+        'reauth_unavailable': "❌ وضع المصادقة التلقائية غير مفعل. استخدم /update_api بدلاً من ذلك.",
+        'reauth_in_progress': "🔐 جاري إعادة المصادقة...",
+        'reauth_success': (
+            "✅ تمت المصادقة بنجاح!\n"
+            "صلاحية التوكن: {hours:.0f} ساعة\n\n"
+            "استخدم /battery لعرض الحالة وبدء المراقبة"
+        ),
+        'reauth_failed': "❌ فشلت المصادقة. تحقق من بيانات الاعتماد في config.py",
+        'status': (
+            "🔋 شحن البطارية: {battery:.0f}%\n"
+            "⚡ فولت الكهرباء: {voltage:.2f}V\n"
+            "🔌 الكهرباء: {electricity_status}\n"
+            "⚙️ استهلاك البطارية: {power:.0f}W ({consumption_status})\n"
+            "🔌 تيار الشحن: {charging_status}\n"
+            "🧊 حالة البراد: {fridge_status}\n"
+            "⏱️ اخر توقيت لوجود الكهرباء: {electricity_time}"
+            "{token_info}"
+        ),
+        'electricity_on': "موجودة ويتم الشحن✔️",
+        'electricity_off': "لا يوجد كهرباء ⚠️",
+        'electricity_available_now': "الكهرباء متوفرة حالياً",
+        'electricity_time_unknown': "غير معلوم 🤷",
+        'electricity_lasted': "{time}\nوقد بقيت الكهرباء لمدة {duration}",
+        'token_valid': "\n🔑 التوكن: صالح ({hours:.0f} ساعة متبقية)",
+        'token_expired': "\n🔑 التوكن: منتهي (سيتم التجديد تلقائياً)",
+        'api_failed_reauthing': "⚠️ تعذر الحصول على البيانات بعد 10 محاولات. جاري محاولة إعادة المصادقة...",
+        'auto_reauth_success': "✅ تمت إعادة المصادقة تلقائياً. ستستمر المراقبة.",
+        'auto_reauth_failed': "❌ فشلت إعادة المصادقة التلقائية. جرّب /reauth يدوياً.",
+        'api_failure_reminder': (
+            "🔔 تذكير: API لا يزال معطلاً منذ {hours} ساعة\n"
+            "جرّب /reauth لإعادة المصادقة"
+        ),
+        'power_alert': "⚠️ تحذير! استهلاك الطاقة كبير جدًا: {power:.0f}W",
+        'power_reduced_alert': "👍 تم خفض استهلاك الطاقة إلى {power:.0f}W.",
+        'electricity_restored_alert': (
+            "✅ عادت الكهرباء! الشحن جارٍ الآن.\n"
+            "نسبة البطارية حالياً هي: {battery:.0f}%"
+        ),
+        'electricity_cut_alert': (
+            "⛔ انقطعت الكهرباء! يتم التشغيل على البطارية.\n"
+            "نسبة البطارية حالياً هي: {battery:.0f}%"
+        ),
+        'electricity_cut_duration_alert': (
+            "⛔ انقطعت الكهرباء! يتم التشغيل على البطارية.\n"
+            "نسبة البطارية حالياً هي: {battery:.0f}%\n"
+            "مدة بقاء الكهرباء: {duration}"
+        ),
+        'battery_up': "⬆️ زيادة",
+        'battery_down': "⬇️ انخفاض",
+        'battery_alert': "{arrow}\nالشحن: {old_battery:.0f}% ← {battery:.0f}%",
+        'fridge_warning_alert': (
+            "🧊⚠️ تنبيه البراد!\n"
+            "البطارية حالياً: {battery:.0f}%\n"
+            "متبقي {remaining:.0f}% فقط لينطفئ البراد عند الوصول لـ {threshold}%"
+        ),
+        'charging_status': "{current:.1f}A ({label})",
+        'charging_very_fast': "الشحن سريع جداً 🔴",
+        'charging_fast': "الشحن سريع 🟡",
+        'charging_normal': "الشحن طبيعي 🟢",
+        'charging_none': "لا يوجد شحن ⚪",
+        'fridge_on_grid': "يعمل على الكهرباء ⚡",
+        'fridge_on_battery': "يعمل على البطارية 🔋",
+        'fridge_on_low_battery': "يعمل على البطارية (البطارية منخفضة) ⚠️",
+        'fridge_off': "مطفئ ⛔",
+        'consumption_normal': "عادي 🟢",
+        'consumption_medium': "متوسط 🟡",
+        'consumption_high': "كبير 🔴",
+        'update_api_usage': (
+            "❌ يرجى توفير عنوان API الجديد بعد الأمر.\n\n"
+            "مثال:\n"
+            "/update_api https://web.dessmonitor.com/public/?sign=..."
+        ),
+        'update_api_testing': "⏳ اختبار الرابط الجديد...",
+        'update_api_success': (
+            "✅ تم تحديث رابط API بنجاح!\n\n"
+            "يمكنك الآن استخدام /battery لعرض الحالة وبدء المراقبة"
+        ),
+        'update_api_failed': (
+            "❌ الرابط الجديد لا يعمل!\n\n"
+            "تم الاحتفاظ بالرابط القديم.\n"
+            "يرجى التحقق من الرابط والمحاولة مرة أخرى."
+        ),
+        'metric_alert_above': "📈 تنبيه {metric}: {value:.2f} أعلى من الحد {threshold}",
+        'metric_alert_below': "📉 تنبيه {metric}: {value:.2f} أقل من الحد {threshold}",
+        'metric_alert_cleared': "👍 عاد {metric} إلى الوضع الطبيعي: {value:.2f}",
+        'chart': (
+            "📈 {metric}\n"
+            "{spark}\n"
+            "أدنى: {min:.2f} | أعلى: {max:.2f} | آخر: {last:.2f}\n"
+            "{points} قراءة خلال {duration}"
+        ),
+        'chart_usage': (
+            "❌ يرجى تحديد المقياس بعد الأمر.\n\n"
+            "المقاييس المتاحة:\n{metrics}\n\n"
+            "مثال:\n"
+            "/chart battery"
+        ),
+        'chart_subscribed': "📊 بدأ تسجيل {metric}. أعد المحاولة بعد بضع دقائق.",
+        'chart_no_data': "⚠️ لا توجد بيانات بعد لـ {metric}.",
+        'admin_only': "❌ هذا الأمر متاح للمشرف فقط.",
+        'profile_started': "🔬 جاري قياس الأداء لمدة {seconds} ثانية...",
+        'profile_busy': "⏳ يوجد قياس أداء قيد التشغيل بالفعل.",
+        'duration_joiner': " و ",
+        'duration_less_than_second': "أقل من ثانية",
+    },
+    'en': {
+        'start': (
+            "Welcome to the power system monitoring bot! 🔋\n\n"
+            "Connection mode: {auth_status}\n\n"
+            "Available commands:\n"
+            "/battery - Show system status and start automatic monitoring\n"
+            "/stop - Stop automatic monitoring\n"
+            "/chart - Chart one of the metrics\n"
+            "/reauth - Re-authenticate manually\n"
+            "/update_api - Update the API URL (legacy manual mode)"
+        ),
+        'auth_mode_api': "✅ Automatic authentication (API)",
+        'auth_mode_url': "⚠️ Manual URL mode",
+        'loading': "⏳ Fetching data...",
+        'fetch_failed': "⚠️ Could not fetch data. Check the logs or try /reauth",
+        'monitoring_stopped': "✅ Automatic monitoring stopped.",
+        'monitoring_not_active': "❌ Automatic monitoring is not active.",
+        'reauth_unavailable': "❌ Automatic authentication is not enabled. Use /update_api instead.",
+        'reauth_in_progress': "🔐 Re-authenticating...",
+        'reauth_success': (
+            "✅ Authentication successful!\n"
+            "Token valid for: {hours:.0f} hours\n\n"
+            "Use /battery to show the status and start monitoring"
+        ),
+        'reauth_failed': "❌ Authentication failed. Check the credentials in config.py",
+        'status': (
+            "🔋 Battery charge: {battery:.0f}%\n"
+            "⚡ Grid voltage: {voltage:.2f}V\n"
+            "🔌 Electricity: {electricity_status}\n"
+            "⚙️ Battery load: {power:.0f}W ({consumption_status})\n"
+            "🔌 Charging current: {charging_status}\n"
+            "🧊 Fridge: {fridge_status}\n"
+            "⏱️ Electricity last seen: {electricity_time}"
+            "{token_info}"
+        ),
+        'electricity_on': "Available and charging ✔️",
+        'electricity_off': "No electricity ⚠️",
+        'electricity_available_now': "Electricity is available now",
+        'electricity_time_unknown': "Unknown 🤷",
+        'electricity_lasted': "{time}\nElectricity lasted {duration}",
+        'token_valid': "\n🔑 Token: valid ({hours:.0f} hours left)",
+        'token_expired': "\n🔑 Token: expired (will be renewed automatically)",
+        'api_failed_reauthing': "⚠️ Could not fetch data after 10 attempts. Trying to re-authenticate...",
+        'auto_reauth_success': "✅ Re-authenticated automatically. Monitoring continues.",
+        'auto_reauth_failed': "❌ Automatic re-authentication failed. Try /reauth manually.",
+        'api_failure_reminder': (
+            "🔔 Reminder: the API has been down for {hours} hours\n"
+            "Try /reauth to re-authenticate"
+        ),
+        'power_alert': "⚠️ Warning! Power usage is very high: {power:.0f}W",
+        'power_reduced_alert': "👍 Power usage reduced to {power:.0f}W.",
+        'electricity_restored_alert': (
+            "✅ Electricity is back! Charging now.\n"
+            "Battery level: {battery:.0f}%"
+        ),
+        'electricity_cut_alert': (
+            "⛔ Electricity cut! Running on battery.\n"
+            "Battery level: {battery:.0f}%"
+        ),
+        'electricity_cut_duration_alert': (
+            "⛔ Electricity cut! Running on battery.\n"
+            "Battery level: {battery:.0f}%\n"
+            "Electricity lasted: {duration}"
+        ),
+        'battery_up': "⬆️ Increase",
+        'battery_down': "⬇️ Decrease",
+        'battery_alert': "{arrow}\nCharge: {old_battery:.0f}% → {battery:.0f}%",
+        'fridge_warning_alert': (
+            "🧊⚠️ Fridge alert!\n"
+            "Battery now: {battery:.0f}%\n"
+            "Only {remaining:.0f}% left before the fridge turns off at {threshold}%"
+        ),
+        'charging_status': "{current:.1f}A ({label})",
+        'charging_very_fast': "very fast charging 🔴",
+        'charging_fast': "fast charging 🟡",
+        'charging_normal': "normal charging 🟢",
+        'charging_none': "not charging ⚪",
+        'fridge_on_grid': "Running on grid ⚡",
+        'fridge_on_battery': "Running on battery 🔋",
+        'fridge_on_low_battery': "Running on battery (battery low) ⚠️",
+        'fridge_off': "Off ⛔",
+        'consumption_normal': "normal 🟢",
+        'consumption_medium': "medium 🟡",
+        'consumption_high': "high 🔴",
+        'update_api_usage': (
+            "❌ Please provide the new API URL after the command.\n\n"
+            "Example:\n"
+            "/update_api https://web.dessmonitor.com/public/?sign=..."
+        ),
+        'update_api_testing': "⏳ Testing the new URL...",
+        'update_api_success': (
+            "✅ API URL updated!\n\n"
+            "You can now use /battery to show the status and start monitoring"
+        ),
+        'update_api_failed': (
+            "❌ The new URL doesn't work!\n\n"
+            "The old URL was kept.\n"
+            "Please check the URL and try again."
+        ),
+        'metric_alert_above': "📈 {metric} alert: {value:.2f} is above {threshold}",
+        'metric_alert_below': "📉 {metric} alert: {value:.2f} is below {threshold}",
+        'metric_alert_cleared': "👍 {metric} is back to normal: {value:.2f}",
+        'chart': (
+            "📈 {metric}\n"
+            "{spark}\n"
+            "min: {min:.2f} | max: {max:.2f} | last: {last:.2f}\n"
+            "{points} readings over {duration}"
+        ),
+        'chart_usage': (
+            "❌ Please give a metric after the command.\n\n"
+            "Available metrics:\n{metrics}\n\n"
+            "Example:\n"
+            "/chart battery"
+        ),
+        'chart_subscribed': "📊 Started recording {metric}. Try again in a few minutes.",
+        'chart_no_data': "⚠️ No data yet for {metric}.",
+        'admin_only': "❌ This command is for the admin only.",
+        'profile_started': "🔬 Profiling for {seconds} seconds...",
+        'profile_busy': "⏳ A profile is already running.",
+        'duration_joiner': ", ",
+        'duration_less_than_second': "less than a second",
+    },
+}
+
+# Duration unit names per language: (singular, plural)
+DURATION_UNITS = {
+    'ar': {'hour': ("ساعة", "ساعات"), 'minute': ("دقيقة", "دقائق"), 'second': ("ثانية", "ثواني")},
+    'en': {'hour': ("hour", "hours"), 'minute': ("minute", "minutes"), 'second': ("second", "seconds")},
+}
+
+
+def _plural_ar(n, singular, plural):
+    # 1 -> bare singular, 2-10 -> count + plural, 11+ -> count + singular
+    if n == 1:
+        return singular
+    return f"{n} {plural}" if n <= 10 else f"{n} {singular}"
+
+
+def _plural_en(n, singular, plural):
+    return f"1 {singular}" if n == 1 else f"{n} {plural}"
+
+
+PLURAL_RULES = {'ar': _plural_ar, 'en': _plural_en}
+PLURAL_TABLE_SIZE = 100  # Counts below this are looked up, larger ones use the rule directly
+
+# Precompiled pluralization tables: PLURAL_TABLES[lang][unit][n] -> text
+PLURAL_TABLES = {
+    lang: {
+        unit: tuple(PLURAL_RULES[lang](n, *forms) for n in range(PLURAL_TABLE_SIZE))
+        for unit, forms in units.items()
+    }
+    for lang, units in DURATION_UNITS.items()
+}
+
+# Decimal places values are rounded to before rendering; matches the template precision
+# so readings that display identically share one cache entry.
+QUANTIZE_DIGITS = {
+    'battery': 0, 'old_battery': 0, 'power': 0, 'remaining': 0, 'hours': 0,
+    'voltage': 2, 'current': 1,
+}
+
+if BOT_LANGUAGE not in MESSAGES:
+    print(f"⚠️ Unknown BOT_LANGUAGE '{BOT_LANGUAGE}', falling back to Arabic")
+    BOT_LANGUAGE = 'ar'
+
+
+@functools.lru_cache(maxsize=4096)
+def _render_cached(lang, key, items):
+    template = MESSAGES[lang].get(key) or MESSAGES['ar'][key]
+    return template.format(**dict(items))
+
+
+def render(key, **values):
+    """Render a message template in BOT_LANGUAGE, memoized per (template, quantized values)."""
+    items = tuple(sorted(
+        (name, round(value, QUANTIZE_DIGITS.get(name, 2)) if isinstance(value, float) else value)
+        for name, value in values.items()
+    ))
+    return _render_cached(BOT_LANGUAGE, key, items)
+
+
+def plural(unit, n):
+    """Localized '<n> <unit>' text using the precompiled pluralization tables."""
+    table = PLURAL_TABLES[BOT_LANGUAGE][unit]
+    if n < PLURAL_TABLE_SIZE:
+        return table[n]
+    return PLURAL_RULES[BOT_LANGUAGE](n, *DURATION_UNITS[BOT_LANGUAGE][unit])
 
 
 # ============================== LOGGING HELPERS ============================== #
@@ -265,11 +805,115 @@ def log_api_data(system_data):
     print(f"[API DATA] {system_data}")
 
 
+# ============================== METRIC SCHEMA ============================== #
+def _kw_to_w(value):
+    return float(value) * 1000
+
+
+# name -> (DessMonitor parameter, converter, default when the parameter is missing)
+METRIC_SCHEMA = {
+    # Core metrics used by the built-in alerts; always extracted
+    'battery': ('bt_battery_capacity', float, 0.0),
+    'voltage': ('bt_grid_voltage', float, 0.0),
+    'power_usage': ('bt_load_active_power_sole', _kw_to_w, 0.0),
+    'fridge_voltage': ('bt_ac2_output_voltage', float, 0.0),
+    'charge_current': ('bt_battery_charging_current', float, 0.0),
+    # Extended metrics; only extracted when subscribed
+    'pv_voltage': ('bt_pv_input_voltage', float, None),
+    'pv_power': ('bt_pv_input_power', float, None),
+    'battery_voltage': ('bt_battery_voltage', float, None),
+    'discharge_current': ('bt_battery_discharge_current', float, None),
+    'output_voltage': ('bt_ac_output_voltage', float, None),
+    'output_frequency': ('bt_ac_output_frequency', float, None),
+    'grid_frequency': ('bt_grid_frequency', float, None),
+    'inverter_temperature': ('bt_inverter_temperature', float, None),
+    'dcdc_temperature': ('bt_dcdc_temperature', float, None),
+}
+CORE_METRICS = ('battery', 'voltage', 'power_usage', 'fridge_voltage', 'charge_current')
+
+subscribed_metrics = set(CORE_METRICS)
+last_parameter_names = frozenset()  # Parameters present in the most recent payload
+_active_schema = ()  # Compiled (name, parameter, converter, default) for subscribed metrics
+
+
+def _compile_schema():
+    global _active_schema
+    _active_schema = tuple(
+        (name, *METRIC_SCHEMA[name]) for name in METRIC_SCHEMA if name in subscribed_metrics
+    )
+
+
+def subscribe_metric(name):
+    """Start extracting and storing a metric. Unknown names are treated as raw
+    DessMonitor parameter names (e.g. bt_battery_temperature) with float values."""
+    if name not in METRIC_SCHEMA:
+        METRIC_SCHEMA[name] = (name, float, None)
+    if name not in subscribed_metrics:
+        subscribed_metrics.add(name)
+        _compile_schema()
+        print(f"📊 Subscribed to metric '{name}'")
+
+
+def extract_metrics(params):
+    """Convert the subscribed metrics from a raw parameter dict, once per poll."""
+    metrics = {}
+    for name, par, convert, default in _active_schema:
+        raw = params.get(par)
+        if raw is None:
+            metrics[name] = default
+        elif default is not None:
+            metrics[name] = convert(raw)  # Core metric: a bad value fails the whole parse
+        else:
+            try:
+                metrics[name] = convert(raw)
+            except (TypeError, ValueError):
+                metrics[name] = None
+    return metrics
+
+
+class MetricStore:
+    """Columnar history of metric readings: one (timestamps, values) column per metric,
+    so a poll only touches the columns of subscribed metrics."""
+
+    def __init__(self, size=METRIC_HISTORY_SIZE):
+        self.size = size
+        self.columns = {}
+        self._lock = threading.Lock()
+
+    def append(self, timestamp, metrics):
+        with self._lock:
+            for name, value in metrics.items():
+                if value is None:
+                    continue
+                column = self.columns.get(name)
+                if column is None:
+                    column = self.columns[name] = (
+                        collections.deque(maxlen=self.size),
+                        collections.deque(maxlen=self.size),
+                    )
+                column[0].append(timestamp)
+                column[1].append(value)
+
+    def series(self, name):
+        """Return (timestamps, values) lists for a metric."""
+        with self._lock:
+            column = self.columns.get(name)
+            if column is None:
+                return [], []
+            return list(column[0]), list(column[1])
+
+
+metric_store = MetricStore()
+
+for _name in METRIC_SUBSCRIPTIONS + [rule['metric'] for rule in METRIC_ALERTS]:
+    subscribe_metric(_name)
+_compile_schema()
+
+
 # ============================== DATA FETCHING ============================== #
 def get_system_data():
     """Get power system data - uses API client with auto-auth, or legacy URL as fallback."""
-    global last_electricity_time, electricity_start_time, electricity_duration
-
+    global last_parameter_names
     raw_data = None
 
     # --- Method 1: Official API with auto-auth (preferred) ---
@@ -277,7 +921,8 @@ def get_system_data():
         for attempt in range(2):
             print(f"🔄 Fetching data via API client... (Attempt {attempt + 1}/2) {datetime.datetime.now().strftime('%H:%M:%S')}")
             raw_data = dess_api.query_device_data()
-            if raw_data:
+            # Retrying is pointless once the breaker is open or a half-open probe is in flight
+            if raw_data or not dess_api.breaker.is_closed():
                 break
             if attempt == 0:
                 time.sleep(1)
@@ -309,27 +954,14 @@ def get_system_data():
     # --- Parse response (same format for both methods) ---
     try:
         params = {item['par']: item['val'] for item in raw_data['dat']['parameter']}
+        last_parameter_names = frozenset(params)
 
-        system_data = {
-            'battery': float(params.get('bt_battery_capacity', 0)),
-            'voltage': float(params.get('bt_grid_voltage', 0)),
-            'charging': float(params.get('bt_grid_voltage', 0)) > 0,
-            'power_usage': float(params.get('bt_load_active_power_sole', 0)) * 1000,
-            'fridge_voltage': float(params.get('bt_ac2_output_voltage', 0)),
-            'charge_current': float(params.get('bt_battery_charging_current', 0))
-        }
-
-        # Update electricity tracking
-        current_time_tz = datetime.datetime.now(TIMEZONE)
-
-        if system_data['charging']:
-            if electricity_start_time is None:
-                electricity_start_time = current_time_tz
-            last_electricity_time = current_time_tz
-        else:
-            if electricity_start_time is not None and last_electricity_time is not None:
-                electricity_duration = last_electricity_time - electricity_start_time
-            electricity_start_time = None
+        system_data = extract_metrics(params)
+        metric_store.append(time.time(), system_data)
+        system_data['charging'] = system_data['voltage'] > 0
+
+        track_electricity(alert_state, system_data, datetime.datetime.now(TIMEZONE))
+        record_reading(system_data)
 
         print("✅ Successfully fetched and parsed data")
         log_api_data(system_data)
@@ -340,8 +972,28 @@ def get_system_data():
         return None
 
 
+async def run_upstream(func, *args):
+    """Run a blocking upstream call on the dedicated upstream executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(upstream_executor, func, *args)
+
+
+async def fetch_system_data():
+    """Run get_system_data, merging concurrent callers onto a single in-flight request.
+
+    The shared future is shielded so a caller hitting its deadline doesn't cancel it
+    for everyone else; a later tick simply picks up the same request. Each caller
+    gets its own copy since callers store per-chat state (reported_battery) in it.
+    """
+    global _inflight_fetch
+    if _inflight_fetch is None or _inflight_fetch.done():
+        _inflight_fetch = asyncio.ensure_future(run_upstream(get_system_data))
+    data = await asyncio.shield(_inflight_fetch)
+    return dict(data) if data else data
+
+
 def format_duration(duration):
-    """Format duration into readable Arabic text."""
+    """Format duration into readable text in BOT_LANGUAGE."""
     if duration is None:
         return ""
 
@@ -353,21 +1005,18 @@ def format_duration(duration):
     duration_parts = []
 
     if hours > 0:
-        hour_text = "ساعة" if hours == 1 else f"{hours} ساعات" if hours <= 10 else f"{hours} ساعة"
-        duration_parts.append(hour_text)
+        duration_parts.append(plural('hour', hours))
 
     if minutes > 0:
-        minute_text = "دقيقة" if minutes == 1 else f"{minutes} دقائق" if minutes <= 10 else f"{minutes} دقيقة"
-        duration_parts.append(minute_text)
+        duration_parts.append(plural('minute', minutes))
 
     if seconds > 0 and hours == 0:
-        second_text = "ثانية" if seconds == 1 else f"{seconds} ثواني" if seconds <= 10 else f"{seconds} ثانية"
-        duration_parts.append(second_text)
+        duration_parts.append(plural('second', seconds))
 
     if not duration_parts:
-        return "أقل من ثانية"
+        return render('duration_less_than_second')
 
-    return " و ".join(duration_parts)
+    return render('duration_joiner').join(duration_parts)
 
 
 # ============================== TELEGRAM COMMANDS ============================== #
@@ -377,17 +1026,8 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     log_command("/start", update.effective_chat.id)
     admin_chat_id = update.effective_chat.id
 
-    auth_status = "✅ مصادقة تلقائية (API)" if dess_api else "⚠️ وضع URL اليدوي"
-
-    reply = (
-        "مرحباً بك في بوت مراقبة نظام الطاقة! 🔋\n\n"
-        f"وضع الاتصال: {auth_status}\n\n"
-        "الأوامر المتاحة:\n"
-        "/battery - عرض حالة النظام وبدء المراقبة التلقائية\n"
-        "/stop - إيقاف المراقبة التلقائية\n"
-        "/reauth - إعادة المصادقة يدوياً\n"
-        "/update_api - تحديث عنوان API (الوضع اليدوي القديم)"
-    )
+    auth_status = render('auth_mode_api') if dess_api else render('auth_mode_url')
+    reply = render('start', auth_status=auth_status)
     log_bot_to_user(update.effective_chat.id, reply)
     await update.message.reply_text(reply)
 
@@ -398,16 +1038,15 @@ async def battery_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     log_command("/battery", update.effective_chat.id)
     admin_chat_id = update.effective_chat.id
 
-    loading = "⏳ جاري الحصول على البيانات..."
+    loading = render('loading')
     log_bot_to_user(update.effective_chat.id, loading)
     status_msg = await update.message.reply_text(loading)
 
-    loop = asyncio.get_event_loop()
-    data = await loop.run_in_executor(None, get_system_data)
+    data = await fetch_system_data()
     log_api_data(data)
 
     if not data:
-        fail_text = "⚠️ تعذر الحصول على البيانات. تحقق من السجلات أو جرّب /reauth"
+        fail_text = render('fetch_failed')
         log_bot_to_user(update.effective_chat.id, fail_text)
         await status_msg.edit_text(fail_text)
         return
@@ -430,11 +1069,12 @@ async def stop_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if jobs:
         for job in jobs:
             job.schedule_removal()
-        msg = "✅ تم إيقاف المراقبة التلقائية بنجاح."
+        job_stats.pop(str(chat_id), None)
+        msg = render('monitoring_stopped')
         log_bot_to_user(update.effective_chat.id, msg)
         await update.message.reply_text(msg)
     else:
-        msg = "❌ المراقبة التلقائية غير مفعلة حالياً."
+        msg = render('monitoring_not_active')
         log_bot_to_user(update.effective_chat.id, msg)
         await update.message.reply_text(msg)
 
@@ -445,64 +1085,280 @@ async def reauth_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     log_command("/reauth", update.effective_chat.id)
 
     if not dess_api:
-        await update.message.reply_text("❌ وضع المصادقة التلقائية غير مفعل. استخدم /update_api بدلاً من ذلك.")
+        await update.message.reply_text(render('reauth_unavailable'))
         return
 
-    status_msg = await update.message.reply_text("🔐 جاري إعادة المصادقة...")
+    status_msg = await update.message.reply_text(render('reauth_in_progress'))
 
-    loop = asyncio.get_event_loop()
-    success = await loop.run_in_executor(None, dess_api.authenticate)
+    success = await run_upstream(dess_api.authenticate)
 
     if success:
         api_failure_notified = False
         consecutive_failures = 0
+        dess_api.breaker.reset()
         expire_hours = (dess_api.token_expiry - time.time()) / 3600
-        msg = (
-            f"✅ تمت المصادقة بنجاح!\n"
-            f"صلاحية التوكن: {expire_hours:.0f} ساعة\n\n"
-            f"استخدم /battery لعرض الحالة وبدء المراقبة"
-        )
+        msg = render('reauth_success', hours=expire_hours)
     else:
-        msg = "❌ فشلت المصادقة. تحقق من بيانات الاعتماد في config.py"
+        msg = render('reauth_failed')
 
     await status_msg.edit_text(msg)
 
 
+async def chart_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /chart command - sparkline of a metric's recent history."""
+    log_command("/chart", update.effective_chat.id)
+
+    # Only known metrics or parameters the device actually reports, so a typo
+    # can't become a permanent per-poll extraction
+    name = context.args[0] if context.args else None
+    if name not in METRIC_SCHEMA and name not in last_parameter_names:
+        msg = render('chart_usage', metrics="\n".join(sorted(METRIC_SCHEMA)))
+    elif name not in subscribed_metrics:
+        subscribe_metric(name)
+        msg = render('chart_subscribed', metric=name)
+    else:
+        msg = format_chart(name)
+
+    log_bot_to_user(update.effective_chat.id, msg)
+    await update.message.reply_text(msg)
+
+
 def format_status_message(data: dict) -> str:
-    global last_electricity_time, electricity_duration
+    last_electricity_time = alert_state['last_electricity_time']
+    electricity_duration = alert_state['electricity_duration']
     if data['charging']:
-        electricity_status = "موجودة ويتم الشحن✔️"
-        electricity_time_str = "الكهرباء متوفرة حالياً"
+        electricity_status = render('electricity_on')
+        electricity_time_str = render('electricity_available_now')
     else:
-        electricity_status = "لا يوجد كهرباء ⚠️"
+        electricity_status = render('electricity_off')
         if last_electricity_time:
-            electricity_time_str = f"{last_electricity_time.strftime('%I:%M:%S %p')}"
+            electricity_time_str = last_electricity_time.strftime('%I:%M:%S %p')
             if electricity_duration:
-                duration_str = format_duration(electricity_duration)
-                electricity_time_str += f"\nوقد بقيت الكهرباء لمدة {duration_str}"
+                electricity_time_str = render(
+                    'electricity_lasted',
+                    time=electricity_time_str,
+                    duration=format_duration(electricity_duration),
+                )
         else:
-            electricity_time_str = "غير معلوم 🤷"
+            electricity_time_str = render('electricity_time_unknown')
 
     # Token status indicator
     token_info = ""
     if dess_api and dess_api.token_expiry:
         remaining = dess_api.token_expiry - time.time()
         if remaining > 0:
-            token_info = f"\n🔑 التوكن: صالح ({remaining/3600:.0f} ساعة متبقية)"
+            token_info = render('token_valid', hours=remaining / 3600)
         else:
-            token_info = "\n🔑 التوكن: منتهي (سيتم التجديد تلقائياً)"
-
-    status_text = (
-        f"🔋 شحن البطارية: {data['battery']:.0f}%\n"
-        f"⚡ فولت الكهرباء: {data['voltage']:.2f}V\n"
-        f"🔌 الكهرباء: {electricity_status}\n"
-        f"⚙️ استهلاك البطارية: {data['power_usage']:.0f}W ({get_consumption_status(data['power_usage'])})\n"
-        f"🔌 تيار الشحن: {get_charging_status(data['charge_current'])}\n"
-        f"🧊 حالة البراد: {get_fridge_status(data)}\n"
-        f"⏱️ اخر توقيت لوجود الكهرباء: {electricity_time_str}"
-        f"{token_info}"
+            token_info = render('token_expired')
+
+    return render(
+        'status',
+        battery=data['battery'],
+        voltage=data['voltage'],
+        electricity_status=electricity_status,
+        power=data['power_usage'],
+        consumption_status=get_consumption_status(data['power_usage']),
+        charging_status=get_charging_status(data['charge_current']),
+        fridge_status=get_fridge_status(data),
+        electricity_time=electricity_time_str,
+        token_info=token_info,
     )
-    return status_text
+
+
+# ============================== ALERT LOGIC ============================== #
+# The alert decisions are kept free of Telegram and job-queue I/O so the same code
+# drives live monitoring and offline replay (where `now` comes from the recording).
+def new_alert_state():
+    return {
+        'last_power_usage': None,
+        'last_electricity_time': None,
+        'electricity_start_time': None,
+        'electricity_duration': None,
+        'fridge_warning_sent': False,
+    }
+
+
+alert_state = new_alert_state()
+
+
+def track_electricity(state: dict, data: dict, now: datetime.datetime):
+    """Update when electricity was last seen and how long the last period lasted."""
+    if data['charging']:
+        if state['electricity_start_time'] is None:
+            state['electricity_start_time'] = now
+        state['last_electricity_time'] = now
+    else:
+        if state['electricity_start_time'] is not None and state['last_electricity_time'] is not None:
+            state['electricity_duration'] = state['last_electricity_time'] - state['electricity_start_time']
+        state['electricity_start_time'] = None
+
+
+def evaluate_alerts(state: dict, old_data: dict, new_data: dict, now: datetime.datetime) -> list:
+    """Decide which alerts a new reading triggers.
+
+    Returns (alert, values) pairs where values are the keyword arguments of the
+    matching ALERT_SENDERS entry. Updates `state` and new_data['reported_battery'].
+    """
+    alerts = []
+
+    # Power Usage
+    if new_data['power_usage'] > POWER_THRESHOLDS[1]:
+        if state['last_power_usage'] is None:
+            alerts.append(('power', {'power_usage': new_data['power_usage']}))
+            state['last_power_usage'] = new_data['power_usage']
+    elif new_data['power_usage'] <= POWER_THRESHOLDS[1] and old_data.get('power_usage', 0) > POWER_THRESHOLDS[1]:
+        alerts.append(('power_reduced', {'power_usage': new_data['power_usage']}))
+        state['last_power_usage'] = None
+
+    # Electricity Status
+    if old_data.get('charging', False) != new_data['charging']:
+        if new_data['charging']:
+            state['electricity_start_time'] = now
+            state['last_electricity_time'] = now
+            state['electricity_duration'] = None
+            state['fridge_warning_sent'] = False
+        alerts.append(('electricity', {
+            'is_charging': new_data['charging'],
+            'battery_level': new_data['battery'],
+            'duration': state['electricity_duration'],
+        }))
+
+    # Fridge Warning
+    if (not new_data['charging'] and
+        new_data['battery'] <= FRIDGE_WARNING_THRESHOLD and
+        new_data['battery'] > FRIDGE_ACTIVATION_THRESHOLD and
+        not state['fridge_warning_sent']):
+        alerts.append(('fridge_warning', {'battery_level': new_data['battery']}))
+        state['fridge_warning_sent'] = True
+    if (new_data['battery'] > FRIDGE_WARNING_THRESHOLD or new_data['battery'] <= FRIDGE_ACTIVATION_THRESHOLD):
+        state['fridge_warning_sent'] = False
+
+    # Battery 10% Change Check
+    last_reported = old_data.get('reported_battery', new_data['battery'])
+
+    if abs(new_data['battery'] - last_reported) >= BATTERY_CHANGE_THRESHOLD:
+        alerts.append(('battery', {'old_value': last_reported, 'new_value': new_data['battery']}))
+        new_data['reported_battery'] = new_data['battery']
+    else:
+        new_data['reported_battery'] = last_reported
+
+    # Metric Threshold Alerts
+    for rule in METRIC_ALERTS:
+        value = new_data.get(rule['metric'])
+        if value is None:
+            continue
+        breached = metric_rule_breached(rule, value)
+        was_breached = metric_rule_breached(rule, old_data.get(rule['metric']))
+        if breached and not was_breached:
+            alerts.append(('metric', {'rule': rule, 'value': value}))
+        elif was_breached and not breached:
+            alerts.append(('metric', {'rule': rule, 'value': value, 'cleared': True}))
+
+    return alerts
+
+
+# ============================== LIVE CONFIG ============================== #
+# Settings that can be changed at runtime (admin API) or per run (replay --set)
+RELOADABLE_SETTINGS = (
+    'BATTERY_CHANGE_THRESHOLD', 'FRIDGE_ACTIVATION_THRESHOLD', 'FRIDGE_WARNING_THRESHOLD',
+    'POWER_THRESHOLDS', 'METRIC_ALERTS',
+)
+
+_pending_settings = {}           # Staged by the admin API, applied between poll ticks
+_settings_lock = threading.Lock()
+_running_checks = 0              # Monitoring ticks currently in progress (event loop only)
+paused_devices = set()           # Device ids whose polling is paused
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _is_metric_rule(rule):
+    """A rule names a metric and has 'above' and/or 'below', each a finite number."""
+    if not isinstance(rule, dict) or not isinstance(rule.get('metric'), str):
+        return False
+    bounds = [k for k in ('above', 'below') if k in rule]
+    return bool(bounds) and all(_is_number(rule[k]) for k in bounds)
+
+
+def current_settings() -> dict:
+    return {name: globals()[name] for name in RELOADABLE_SETTINGS}
+
+
+def validate_settings(settings: dict, base: dict = None) -> dict:
+    """Check and normalize a settings update. Raises ValueError on bad input.
+
+    Cross-field rules are checked against `base` (default: the live settings)
+    with the update applied on top.
+    """
+    if not isinstance(settings, dict):
+        raise ValueError("Settings must be an object of NAME: value")
+    clean = {}
+    for name, value in settings.items():
+        if name not in RELOADABLE_SETTINGS:
+            raise ValueError(f"{name} can't be changed (choose from {', '.join(RELOADABLE_SETTINGS)})")
+        if name == 'POWER_THRESHOLDS':
+            if not (isinstance(value, (list, tuple)) and len(value) == 2
+                    and all(_is_number(v) and v >= 0 for v in value) and value[0] <= value[1]):
+                raise ValueError("POWER_THRESHOLDS must be [low, high] with 0 <= low <= high")
+            value = tuple(value)
+        elif name == 'METRIC_ALERTS':
+            if not isinstance(value, (list, tuple)) or not all(_is_metric_rule(rule) for rule in value):
+                raise ValueError("METRIC_ALERTS must be a list of {'metric': name, 'above'/'below': number}")
+            value = [dict(rule) for rule in value]
+        elif not _is_number(value):
+            raise ValueError(f"{name} must be a number")
+        elif name == 'BATTERY_CHANGE_THRESHOLD' and not 0 < value <= 100:
+            raise ValueError("BATTERY_CHANGE_THRESHOLD must be above 0 and at most 100")
+        elif name in ('FRIDGE_ACTIVATION_THRESHOLD', 'FRIDGE_WARNING_THRESHOLD') and not 0 <= value <= 100:
+            raise ValueError(f"{name} must be between 0 and 100")
+        clean[name] = value
+
+    merged = {**(base if base is not None else current_settings()), **clean}
+    if merged['FRIDGE_ACTIVATION_THRESHOLD'] >= merged['FRIDGE_WARNING_THRESHOLD']:
+        raise ValueError("FRIDGE_ACTIVATION_THRESHOLD must be below FRIDGE_WARNING_THRESHOLD")
+    return clean
+
+
+def apply_settings(settings: dict):
+    """Swap in validated settings. Callers make sure no poll tick is mid-check."""
+    globals().update(settings)
+    for rule in settings.get('METRIC_ALERTS', ()):
+        subscribe_metric(rule['metric'])
+    print(f"⚙️ Applied settings: {settings}")
+
+
+def stage_settings(settings: dict) -> dict:
+    """Validate a settings update and queue it for the next gap between poll ticks.
+
+    Validated against the live settings plus anything already pending, inside the
+    same lock that stages it, so two updates can't combine into an invalid state.
+    Safe to call from any thread. Raises ValueError on bad input.
+    """
+    with _settings_lock:
+        settings = validate_settings(settings, {**current_settings(), **_pending_settings})
+        _pending_settings.update(settings)
+    if admin_loop is not None:
+        admin_loop.call_soon_threadsafe(apply_pending_settings)
+    return settings
+
+
+def apply_pending_settings():
+    """Apply staged settings if no tick is running. Runs on the event loop thread,
+    so a tick can't start halfway through; otherwise the last tick to finish applies them."""
+    if _running_checks:
+        return
+    with _settings_lock:
+        if not _pending_settings:
+            return
+        settings = dict(_pending_settings)
+        _pending_settings.clear()
+    apply_settings(settings)
+
+
+def device_id():
+    return dess_api.device_sn if dess_api else "legacy"
 
 
 # ============================== AUTOMATIC MONITORING ============================== #
@@ -514,20 +1370,75 @@ def start_auto_monitoring(update: Update, context: ContextTypes.DEFAULT_TYPE, in
         job.schedule_removal()
     context.job_queue.run_repeating(
         check_for_changes,
-        interval=10,
+        interval=CHECK_INTERVAL,
         first=5,
         chat_id=chat_id,
         name=str(chat_id),
-        data=initial_data
+        data=initial_data,
+        # APScheduler's default max_instances=1 would silently drop overlapping ticks
+        # before check_for_changes sees them; allow one extra so the guard can count them
+        job_kwargs={'max_instances': 2},
     )
+    maybe_start_startup_profile(context.job_queue)
+
+
+def new_job_stats():
+    return {
+        'running': False,
+        'runs': 0,
+        'missed_ticks': 0,    # Ticks skipped because the previous run was still going
+        'overruns': 0,        # Runs that took longer than CHECK_INTERVAL
+        'deadline_hits': 0,   # Runs that gave up waiting on the upstream
+        'paused_ticks': 0,    # Ticks skipped because the device is paused
+        'last_run': None,
+        'last_latency': None,
+    }
 
 
 async def check_for_changes(context: ContextTypes.DEFAULT_TYPE):
-    global last_power_usage, fridge_warning_sent, api_failure_notified, last_api_failure_time, consecutive_failures
+    """Scheduled tick: skips if the previous tick for this job is still running
+    or the device is paused. Staged settings are applied only between ticks."""
+    global _running_checks
+    stats = job_stats.setdefault(context.job.name, new_job_stats())
+    if device_id() in paused_devices:
+        stats['paused_ticks'] += 1
+        return
+    if stats['running']:
+        stats['missed_ticks'] += 1
+        print(f"⏭️ Skipping tick for {context.job.name}: previous check still running "
+              f"(missed={stats['missed_ticks']}, overruns={stats['overruns']})")
+        return
+
+    apply_pending_settings()
+    stats['running'] = True
+    _running_checks += 1
+    started = time.monotonic()
+    try:
+        await run_check(context, stats)
+    finally:
+        elapsed = time.monotonic() - started
+        _running_checks -= 1
+        apply_pending_settings()
+        stats['running'] = False
+        stats['runs'] += 1
+        stats['last_run'] = datetime.datetime.now(TIMEZONE)
+        stats['last_latency'] = elapsed
+        if elapsed > CHECK_INTERVAL:
+            stats['overruns'] += 1
+            print(f"🐢 Check for {context.job.name} overran: {elapsed:.1f}s > {CHECK_INTERVAL}s "
+                  f"(overruns={stats['overruns']})")
+
+
+async def run_check(context: ContextTypes.DEFAULT_TYPE, stats: dict):
+    global api_failure_notified, last_api_failure_time, consecutive_failures
 
     old_data = context.job.data
-    loop = asyncio.get_event_loop()
-    new_data = await loop.run_in_executor(None, get_system_data)
+    try:
+        new_data = await asyncio.wait_for(fetch_system_data(), timeout=CHECK_DEADLINE)
+    except asyncio.TimeoutError:
+        stats['deadline_hits'] += 1
+        print(f"⏰ Upstream did not answer within {CHECK_DEADLINE}s (deadline_hits={stats['deadline_hits']})")
+        new_data = None
     log_api_data(new_data)
 
     # --- 1. Handle API Failure ---
@@ -535,20 +1446,25 @@ async def check_for_changes(context: ContextTypes.DEFAULT_TYPE):
         consecutive_failures += 1
         print(f"📡 Failed to get data (attempt {consecutive_failures}/10)")
         if consecutive_failures >= 10 and not api_failure_notified:
-            txt = "⚠️ تعذر الحصول على البيانات بعد 10 محاولات. جاري محاولة إعادة المصادقة..."
+            txt = render('api_failed_reauthing')
             log_bot_to_user(context.job.chat_id, txt)
             await context.bot.send_message(chat_id=context.job.chat_id, text=txt)
 
             # Try re-authenticating automatically
             if dess_api:
-                reauth_success = await loop.run_in_executor(None, dess_api.authenticate)
+                try:
+                    reauth_success = await asyncio.wait_for(run_upstream(dess_api.authenticate), timeout=CHECK_DEADLINE)
+                except asyncio.TimeoutError:
+                    stats['deadline_hits'] += 1
+                    reauth_success = False
                 if reauth_success:
-                    reauth_txt = "✅ تمت إعادة المصادقة تلقائياً. ستستمر المراقبة."
+                    reauth_txt = render('auto_reauth_success')
                     await context.bot.send_message(chat_id=context.job.chat_id, text=reauth_txt)
                     consecutive_failures = 0
+                    dess_api.breaker.reset()
                     return
                 else:
-                    fail_txt = "❌ فشلت إعادة المصادقة التلقائية. جرّب /reauth يدوياً."
+                    fail_txt = render('auto_reauth_failed')
                     await context.bot.send_message(chat_id=context.job.chat_id, text=fail_txt)
 
             api_failure_notified = True
@@ -567,41 +1483,10 @@ async def check_for_changes(context: ContextTypes.DEFAULT_TYPE):
     for job in context.job_queue.get_jobs_by_name(f"{context.job.chat_id}_reminder"):
         job.schedule_removal()
 
-    # --- 2. Check Standard Alerts ---
-
-    # Power Usage
-    if new_data['power_usage'] > POWER_THRESHOLDS[1]:
-        if last_power_usage is None:
-            await send_power_alert(context, new_data['power_usage'])
-            last_power_usage = new_data['power_usage']
-    elif new_data['power_usage'] <= POWER_THRESHOLDS[1] and old_data.get('power_usage', 0) > POWER_THRESHOLDS[1]:
-        await send_power_reduced_alert(context, new_data['power_usage'])
-        last_power_usage = None
-
-    # Electricity Status
-    if old_data.get('charging', False) != new_data['charging']:
-        await send_electricity_alert(context, new_data['charging'], new_data['battery'])
-        if new_data['charging']:
-            fridge_warning_sent = False
-
-    # Fridge Warning
-    if (not new_data['charging'] and
-        new_data['battery'] <= FRIDGE_WARNING_THRESHOLD and
-        new_data['battery'] > FRIDGE_ACTIVATION_THRESHOLD and
-        not fridge_warning_sent):
-        await send_fridge_warning_alert(context, new_data['battery'])
-        fridge_warning_sent = True
-    if (new_data['battery'] > FRIDGE_WARNING_THRESHOLD or new_data['battery'] <= FRIDGE_ACTIVATION_THRESHOLD):
-        fridge_warning_sent = False
-
-    # --- 3. Battery 10% Change Check ---
-    last_reported = old_data.get('reported_battery', new_data['battery'])
-
-    if abs(new_data['battery'] - last_reported) >= BATTERY_CHANGE_THRESHOLD:
-        await send_battery_alert(context, last_reported, new_data['battery'])
-        new_data['reported_battery'] = new_data['battery']
-    else:
-        new_data['reported_battery'] = last_reported
+    # --- 2. Evaluate and send alerts ---
+    alerts = evaluate_alerts(alert_state, old_data, new_data, datetime.datetime.now(TIMEZONE))
+    for alert, values in alerts:
+        await ALERT_SENDERS[alert](context, **values)
 
     context.job.data = new_data
     print(f"🔄 Check completed - {datetime.datetime.now().strftime('%H:%M:%S')}")
@@ -612,17 +1497,14 @@ async def send_api_failure_reminder(context: ContextTypes.DEFAULT_TYPE):
     if last_api_failure_time:
         duration = datetime.datetime.now() - last_api_failure_time
         hours = int(duration.total_seconds() / 3600)
-        txt = (
-            f"🔔 تذكير: API لا يزال معطلاً منذ {hours} ساعة\n"
-            "جرّب /reauth لإعادة المصادقة"
-        )
+        txt = render('api_failure_reminder', hours=hours)
         log_bot_to_user(context.job.chat_id, txt)
         await context.bot.send_message(chat_id=context.job.chat_id, text=txt)
 
 
 # ============================== ALERT MESSAGES ============================== #
 async def send_power_alert(context: ContextTypes.DEFAULT_TYPE, power_usage: float):
-    message = f"⚠️ تحذير! استهلاك الطاقة كبير جدًا: {power_usage:.0f}W"
+    message = render('power_alert', power=power_usage)
     try:
         log_bot_to_user(context.job.chat_id, message)
         await context.bot.send_message(chat_id=context.job.chat_id, text=message)
@@ -631,7 +1513,7 @@ async def send_power_alert(context: ContextTypes.DEFAULT_TYPE, power_usage: floa
 
 
 async def send_power_reduced_alert(context: ContextTypes.DEFAULT_TYPE, power_usage: float):
-    message = f"👍 تم خفض استهلاك الطاقة إلى {power_usage:.0f}W."
+    message = render('power_reduced_alert', power=power_usage)
     try:
         log_bot_to_user(context.job.chat_id, message)
         await context.bot.send_message(chat_id=context.job.chat_id, text=message)
@@ -639,32 +1521,19 @@ async def send_power_reduced_alert(context: ContextTypes.DEFAULT_TYPE, power_usa
         print(f"Failed to send reduced power alert: {e}")
 
 
-async def send_electricity_alert(context: ContextTypes.DEFAULT_TYPE, is_charging: bool, battery_level: float):
-    global last_electricity_time, electricity_start_time, electricity_duration
-
-    current_time = datetime.datetime.now(TIMEZONE)
-
+async def send_electricity_alert(context: ContextTypes.DEFAULT_TYPE, is_charging: bool, battery_level: float,
+                                 duration: datetime.timedelta = None):
     if is_charging:
-        electricity_start_time = current_time
-        last_electricity_time = current_time
-        electricity_duration = None
-        message = (
-            f"✅ عادت الكهرباء! الشحن جارٍ الآن.\n"
-            f"نسبة البطارية حالياً هي: {battery_level:.0f}%"
-        )
+        message = render('electricity_restored_alert', battery=battery_level)
     else:
-        if electricity_duration is not None:
-            duration_str = format_duration(electricity_duration)
-            message = (
-                f"⛔ انقطعت الكهرباء! يتم التشغيل على البطارية.\n"
-                f"نسبة البطارية حالياً هي: {battery_level:.0f}%\n"
-                f"مدة بقاء الكهرباء: {duration_str}"
+        if duration is not None:
+            message = render(
+                'electricity_cut_duration_alert',
+                battery=battery_level,
+                duration=format_duration(duration),
             )
         else:
-            message = (
-                f"⛔ انقطعت الكهرباء! يتم التشغيل على البطارية.\n"
-                f"نسبة البطارية حالياً هي: {battery_level:.0f}%"
-            )
+            message = render('electricity_cut_alert', battery=battery_level)
 
     try:
         log_bot_to_user(context.job.chat_id, message)
@@ -674,8 +1543,8 @@ async def send_electricity_alert(context: ContextTypes.DEFAULT_TYPE, is_charging
 
 
 async def send_battery_alert(context: ContextTypes.DEFAULT_TYPE, old_value: float, new_value: float):
-    arrow = "⬆️ زيادة" if new_value > old_value else "⬇️ انخفاض"
-    message = f"{arrow}\nالشحن: {old_value:.0f}% ← {new_value:.0f}%"
+    arrow = render('battery_up') if new_value > old_value else render('battery_down')
+    message = render('battery_alert', arrow=arrow, old_battery=old_value, battery=new_value)
     try:
         log_bot_to_user(context.job.chat_id, message)
         await context.bot.send_message(chat_id=context.job.chat_id, text=message)
@@ -685,10 +1554,11 @@ async def send_battery_alert(context: ContextTypes.DEFAULT_TYPE, old_value: floa
 
 async def send_fridge_warning_alert(context: ContextTypes.DEFAULT_TYPE, battery_level: float):
     remaining_percentage = battery_level - FRIDGE_ACTIVATION_THRESHOLD
-    message = (
-        f"🧊⚠️ تنبيه البراد!\n"
-        f"البطارية حالياً: {battery_level:.0f}%\n"
-        f"متبقي {remaining_percentage:.0f}% فقط لينطفئ البراد عند الوصول لـ {FRIDGE_ACTIVATION_THRESHOLD}%"
+    message = render(
+        'fridge_warning_alert',
+        battery=battery_level,
+        remaining=remaining_percentage,
+        threshold=FRIDGE_ACTIVATION_THRESHOLD,
     )
     try:
         log_bot_to_user(context.job.chat_id, message)
@@ -697,33 +1567,93 @@ async def send_fridge_warning_alert(context: ContextTypes.DEFAULT_TYPE, battery_
         print(f"Failed to send fridge warning alert: {e}")
 
 
+async def send_metric_alert(context: ContextTypes.DEFAULT_TYPE, rule: dict, value: float, cleared: bool = False):
+    if cleared:
+        message = render('metric_alert_cleared', metric=rule['metric'], value=value)
+    elif 'above' in rule:
+        message = render('metric_alert_above', metric=rule['metric'], value=value, threshold=rule['above'])
+    else:
+        message = render('metric_alert_below', metric=rule['metric'], value=value, threshold=rule['below'])
+    try:
+        log_bot_to_user(context.job.chat_id, message)
+        await context.bot.send_message(chat_id=context.job.chat_id, text=message)
+    except Exception as e:
+        print(f"Failed to send metric alert: {e}")
+
+
+ALERT_SENDERS = {
+    'power': send_power_alert,
+    'power_reduced': send_power_reduced_alert,
+    'electricity': send_electricity_alert,
+    'fridge_warning': send_fridge_warning_alert,
+    'battery': send_battery_alert,
+    'metric': send_metric_alert,
+}
+
+
 # ============================== STATUS HELPERS ============================== #
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+def metric_rule_breached(rule: dict, value) -> bool:
+    if value is None:
+        return False
+    if 'above' in rule and value > rule['above']:
+        return True
+    if 'below' in rule and value < rule['below']:
+        return True
+    return False
+
+
+def format_chart(name: str) -> str:
+    """Render a metric's stored history as a text sparkline with min/max/last."""
+    timestamps, values = metric_store.series(name)
+    if not values:
+        return render('chart_no_data', metric=name)
+
+    # Average into CHART_WIDTH buckets
+    bucket = max(1, -(-len(values) // CHART_WIDTH))
+    points = [sum(values[i:i + bucket]) / len(values[i:i + bucket]) for i in range(0, len(values), bucket)]
+    low, high = min(values), max(values)
+    span = (high - low) or 1
+    spark = "".join(SPARK_CHARS[int((p - low) / span * (len(SPARK_CHARS) - 1))] for p in points)
+
+    duration = datetime.timedelta(seconds=timestamps[-1] - timestamps[0])
+    # Not memoized: the sparkline changes on every poll
+    return MESSAGES[BOT_LANGUAGE]['chart'].format(
+        metric=name, spark=spark, min=low, max=high, last=values[-1],
+        points=len(values), duration=format_duration(duration),
+    )
+
+
 def get_charging_status(current: float) -> str:
     if current >= 60:
-        return f"{current:.1f}A (الشحن سريع جداً 🔴)"
+        label = render('charging_very_fast')
     elif 30 <= current < 60:
-        return f"{current:.1f}A (الشحن سريع 🟡)"
+        label = render('charging_fast')
     elif 1 <= current < 30:
-        return f"{current:.1f}A (الشحن طبيعي 🟢)"
-    return f"{current:.1f}A (لا يوجد شحن ⚪)"
+        label = render('charging_normal')
+    else:
+        label = render('charging_none')
+    return render('charging_status', current=current, label=label)
 
 
 def get_fridge_status(data: dict) -> str:
     if data['charging']:
-        return "يعمل على الكهرباء ⚡"
+        return render('fridge_on_grid')
     elif data['battery'] > FRIDGE_ACTIVATION_THRESHOLD:
-        return "يعمل على البطارية 🔋"
+        return render('fridge_on_battery')
     elif data['fridge_voltage'] > 0 and not data['charging']:
-        return "يعمل على البطارية (البطارية منخفضة) ⚠️"
-    return "مطفئ ⛔"
+        return render('fridge_on_low_battery')
+    return render('fridge_off')
 
 
 def get_consumption_status(power: float) -> str:
     if power <= POWER_THRESHOLDS[0]:
-        return "عادي 🟢"
+        return render('consumption_normal')
     elif POWER_THRESHOLDS[0] < power <= POWER_THRESHOLDS[1]:
-        return "متوسط 🟡"
-    return "كبير 🔴"
+        return render('consumption_medium')
+    return render('consumption_high')
 
 
 # ============================== LEGACY: API URL UPDATE COMMAND ============================== #
@@ -733,11 +1663,7 @@ async def update_api_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     log_command("/update_api", update.effective_chat.id)
 
     if not context.args or len(context.args) < 1:
-        msg = (
-            "❌ يرجى توفير عنوان API الجديد بعد الأمر.\n\n"
-            "مثال:\n"
-            "/update_api https://web.dessmonitor.com/public/?sign=..."
-        )
+        msg = render('update_api_usage')
         log_bot_to_user(update.effective_chat.id, msg)
         await update.message.reply_text(msg)
         return
@@ -746,12 +1672,12 @@ async def update_api_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     old_url = LEGACY_API_URL
     LEGACY_API_URL = new_url
 
-    test_msg_txt = "⏳ اختبار الرابط الجديد..."
+    test_msg_txt = render('update_api_testing')
     log_bot_to_user(update.effective_chat.id, test_msg_txt)
     test_msg = await update.message.reply_text(test_msg_txt)
 
-    loop = asyncio.get_event_loop()
-    data = await loop.run_in_executor(None, get_system_data)
+    # Not merged with an in-flight fetch: that one may still be using the old URL
+    data = await run_upstream(get_system_data)
     log_api_data(data)
 
     if data:
@@ -761,41 +1687,450 @@ async def update_api_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         api_failure_notified = False
         last_api_failure_time = None
         consecutive_failures = 0
-        msg = (
-            f"✅ تم تحديث رابط API بنجاح!\n\n"
-            f"يمكنك الآن استخدام /battery لعرض الحالة وبدء المراقبة"
-        )
+        msg = render('update_api_success')
         log_bot_to_user(update.effective_chat.id, msg)
         await test_msg.edit_text(msg)
     else:
         LEGACY_API_URL = old_url
-        msg = (
-            f"❌ الرابط الجديد لا يعمل!\n\n"
-            f"تم الاحتفاظ بالرابط القديم.\n"
-            f"يرجى التحقق من الرابط والمحاولة مرة أخرى."
-        )
+        msg = render('update_api_failed')
         log_bot_to_user(update.effective_chat.id, msg)
         await test_msg.edit_text(msg)
 
 
+# ============================== ADMIN HTTP API ============================== #
+admin_application = None  # Set in on_startup so the admin API can reach the job queue
+admin_loop = None
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def list_jobs():
+    jobs = []
+    for job in admin_application.job_queue.jobs():
+        stats = job_stats.get(job.name, {})
+        jobs.append({
+            'name': job.name,
+            'chat_id': job.chat_id,
+            'callback': job.callback.__name__,
+            'enabled': job.enabled,
+            'next_run': _iso(job.next_t),
+            'last_run': _iso(stats.get('last_run')),
+            'last_latency': stats.get('last_latency'),
+            **{k: v for k, v in stats.items() if k not in ('last_run', 'last_latency')},
+        })
+    return jobs
+
+
+def device_health():
+    if not dess_api:
+        return [{
+            'device': device_id(),
+            'mode': 'legacy_url',
+            'configured': bool(LEGACY_API_URL),
+            'paused': device_id() in paused_devices,
+        }]
+
+    now = time.time()
+    stats = dess_api.stats
+    return [{
+        'device': device_id(),
+        'mode': 'api',
+        'paused': device_id() in paused_devices,
+        'token_age': now - dess_api.token_issued_at if dess_api.token_issued_at else None,
+        'token_expires_in': dess_api.token_expiry - now if dess_api.token_expiry else None,
+        'queries': stats['queries'],
+        'failures': stats['failures'],
+        'rejected': stats['rejected'],
+        'error_rate': stats['failures'] / stats['queries'] if stats['queries'] else 0.0,
+        'circuit': dess_api.breaker.state,
+        'latency_p95': dess_api.latency_p95(),
+    }]
+
+
+def create_admin_app():
+    """Build the Flask app for the admin API. Every route needs the bearer token."""
+    from flask import Flask, abort, jsonify, request
+
+    app = Flask("battery-status-bot-admin")
+
+    @app.before_request
+    def check_token():
+        scheme, _, supplied = request.headers.get("Authorization", "").partition(" ")
+        if scheme != "Bearer" or not hmac.compare_digest(supplied.encode(), ADMIN_API_TOKEN.encode()):
+            abort(401)
+
+    @app.get("/config")
+    def get_config():
+        with _settings_lock:
+            pending = dict(_pending_settings)
+        return jsonify(current=current_settings(), pending=pending)
+
+    @app.post("/config")
+    def update_config():
+        try:
+            settings = stage_settings(request.get_json(force=True, silent=True))
+        except ValueError as e:
+            return jsonify(error=str(e)), 400
+        return jsonify(pending=settings), 202
+
+    @app.get("/jobs")
+    def get_jobs():
+        return jsonify(jobs=list_jobs())
+
+    @app.get("/devices")
+    def get_devices():
+        return jsonify(devices=device_health())
+
+    @app.post("/devices/<device>/<action>")
+    def set_device_polling(device, action):
+        if device != device_id():
+            abort(404)
+        if action == "pause":
+            paused_devices.add(device)
+        elif action == "resume":
+            paused_devices.discard(device)
+        else:
+            abort(404)
+        print(f"⏯️ Polling for device {device}: {action}")
+        return jsonify(device=device, paused=device in paused_devices)
+
+    return app
+
+
+def start_admin_api():
+    """Serve the admin API from a background thread next to the bot.
+
+    The admin API is optional: if it can't bind, log it and keep the bot running.
+    """
+    from werkzeug.serving import make_server
+
+    try:
+        server = make_server(ADMIN_API_HOST, ADMIN_API_PORT, create_admin_app(), threaded=True)
+    except (OSError, SystemExit) as e:
+        # Werkzeug reports some bind failures (e.g. port in use) by calling sys.exit
+        reason = e.strerror if isinstance(e, OSError) else "see error above"
+        print(f"❌ Admin API could not listen on {ADMIN_API_HOST}:{ADMIN_API_PORT} ({reason}), continuing without it")
+        return None
+    threading.Thread(target=server.serve_forever, name="admin-api", daemon=True).start()
+    print(f"🛠️ Admin API listening on {ADMIN_API_HOST}:{ADMIN_API_PORT}")
+    return server
+
+
+async def on_startup(application):
+    global admin_application, admin_loop
+    admin_application = application
+    admin_loop = asyncio.get_running_loop()
+    if ADMIN_API_TOKEN:
+        start_admin_api()
+
+
+# ============================== PROFILING ============================== #
+class SamplingProfiler:
+    """Samples every thread's stack at a fixed interval via sys._current_frames().
+
+    Only stacks that are running this module's code (besides main() itself) are
+    counted, so idle executor threads and the idle event loop don't drown out
+    the poll loop.
+    """
+
+    def __init__(self, interval=PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = 0
+        self.active_samples = 0
+        self.self_counts = collections.Counter()
+        self.inclusive_counts = collections.Counter()
+
+    @staticmethod
+    def _frame_key(code):
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _sample(self, own_thread_id):
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread_id:
+                continue
+            self.samples += 1
+            stack = []
+            ours = False
+            while frame is not None:
+                code = frame.f_code
+                if code.co_filename == __file__ and code.co_name != 'main':
+                    ours = True
+                stack.append(code)
+                frame = frame.f_back
+            if not ours:
+                continue
+            self.active_samples += 1
+            self.self_counts[self._frame_key(stack[0])] += 1
+            for key in {self._frame_key(code) for code in stack}:
+                self.inclusive_counts[key] += 1
+
+    def run(self, seconds):
+        """Sample for the given number of seconds (blocking)."""
+        own_thread_id = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            self._sample(own_thread_id)
+            time.sleep(self.interval)
+        return self
+
+    def summary(self, top=PROFILE_TOP_N):
+        if not self.active_samples:
+            return f"No poll-loop activity in {self.samples} samples"
+        lines = [f"Samples: {self.active_samples} active / {self.samples} total", "", "Self time:"]
+        for key, count in self.self_counts.most_common(top):
+            lines.append(f"  {count / self.active_samples:6.1%}  {key}")
+        lines += ["", "Inclusive time:"]
+        for key, count in self.inclusive_counts.most_common(top):
+            lines.append(f"  {count / self.active_samples:6.1%}  {key}")
+        return "\n".join(lines)
+
+
+def _deep_sizeof(obj, seen=None):
+    """Approximate memory footprint of an object and the containers it holds."""
+    seen = seen if seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, collections.deque)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def memory_report(job_queue=None, top=PROFILE_TOP_N):
+    """Per-chat monitoring state size (total, average and the largest few chats),
+    shared metric history size and process peak RSS. Bounded in length whatever
+    the number of chats, so it fits in a Telegram message."""
+    sizes = []
+    if job_queue is not None:
+        for job in job_queue.jobs():
+            if job.callback is check_for_changes:
+                sizes.append((_deep_sizeof(job.data) + _deep_sizeof(job_stats.get(job.name)), job.name))
+    total = sum(size for size, _ in sizes)
+    lines = [f"Monitored chats: {len(sizes)}, {total / 1024:.1f} KiB total"]
+    if sizes:
+        lines.append(f"  average per chat: {total / len(sizes) / 1024:.1f} KiB")
+        for size, name in sorted(sizes, reverse=True)[:top]:
+            lines.append(f"  chat {name}: {size / 1024:.1f} KiB")
+    lines.append(f"Metric history (shared): {_deep_sizeof(metric_store.columns) / 1024:.1f} KiB")
+    try:
+        import resource
+        lines.append(f"Peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB")
+    except ImportError:
+        pass
+    return "\n".join(lines)
+
+
+def profile_poll_loop(seconds, job_queue=None):
+    """Profile for the given number of seconds and return a text summary."""
+    print(f"🔬 Profiling for {seconds}s...")
+    profiler = SamplingProfiler().run(seconds)
+    return f"{profiler.summary()}\n\n{memory_report(job_queue)}"
+
+
+_profile_running = False  # Only one /profile at a time
+_startup_profile_pending = bool(PROFILE_ON_START)
+
+
+def maybe_start_startup_profile(job_queue):
+    """Run the PROFILE_ON_START profile once, when the first monitoring job is scheduled.
+    Jobs only exist after /battery, so profiling right at startup would see no polls."""
+    global _startup_profile_pending
+    if not _startup_profile_pending:
+        return
+    _startup_profile_pending = False
+    threading.Thread(
+        target=lambda: print(profile_poll_loop(PROFILE_ON_START, job_queue)),
+        name="startup-profiler",
+        daemon=True,
+    ).start()
+
+
+async def profile_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /profile [seconds] - sample the poll loop and report hot spots and memory."""
+    log_command("/profile", update.effective_chat.id)
+
+    global _profile_running
+    if update.effective_chat.id not in ADMIN_CHAT_IDS:
+        await update.message.reply_text(render('admin_only'))
+        return
+    if _profile_running:
+        await update.message.reply_text(render('profile_busy'))
+        return
+
+    try:
+        seconds = int(context.args[0]) if context.args else PROFILE_DEFAULT_SECONDS
+    except ValueError:
+        seconds = PROFILE_DEFAULT_SECONDS
+    seconds = max(1, min(seconds, PROFILE_MAX_SECONDS))
+
+    _profile_running = True
+    try:
+        status_msg = await update.message.reply_text(render('profile_started', seconds=seconds))
+        # Default executor, not upstream_executor: the profiler must not take a poll thread
+        loop = asyncio.get_running_loop()
+        summary = await loop.run_in_executor(None, profile_poll_loop, seconds, context.job_queue)
+    finally:
+        _profile_running = False
+    log_bot_to_user(update.effective_chat.id, summary)
+    await status_msg.edit_text(summary[:TELEGRAM_MESSAGE_LIMIT])
+
+
+# ============================== RECORDING & REPLAY ============================== #
+def record_reading(system_data: dict):
+    """Append a reading to RECORD_READINGS as a JSON line, for later replay."""
+    if not RECORD_READINGS:
+        return
+    reading = {'t': time.time()}
+    reading.update((k, v) for k, v in system_data.items() if k != 'charging')
+    try:
+        with open(RECORD_READINGS, 'a') as f:
+            f.write(json.dumps(reading) + "\n")
+    except OSError as e:
+        print(f"❌ Failed to record reading: {e}")
+
+
+def replay_readings(lines, on_alert=None):
+    """Run recorded readings through evaluate_alerts on a virtual clock.
+
+    Each line is a JSON reading as written by record_reading. Returns
+    (readings processed, Counter of alerts fired).
+    """
+    state = new_alert_state()
+    counts = collections.Counter()
+    old_data = None
+    processed = 0
+    loads = json.loads
+    fromtimestamp = datetime.datetime.fromtimestamp
+
+    for line in lines:
+        if not line.strip():
+            continue
+        data = loads(line)
+        now = fromtimestamp(data.pop('t'), TIMEZONE)
+        data['charging'] = data['voltage'] > 0
+        processed += 1
+
+        track_electricity(state, data, now)
+        if old_data is None:
+            # Same starting point as /battery: the first reading is the reported level
+            data['reported_battery'] = data['battery']
+        else:
+            for alert, values in evaluate_alerts(state, old_data, data, now):
+                counts[alert] += 1
+                if on_alert:
+                    on_alert(now, alert, values)
+        old_data = data
+
+    return processed, counts
+
+
+def _alert_text(alert, values):
+    """Render an alert the way it would be sent, on a single line."""
+    if alert == 'power':
+        text = render('power_alert', power=values['power_usage'])
+    elif alert == 'power_reduced':
+        text = render('power_reduced_alert', power=values['power_usage'])
+    elif alert == 'electricity':
+        if values['is_charging']:
+            text = render('electricity_restored_alert', battery=values['battery_level'])
+        elif values['duration'] is not None:
+            text = render('electricity_cut_duration_alert', battery=values['battery_level'],
+                          duration=format_duration(values['duration']))
+        else:
+            text = render('electricity_cut_alert', battery=values['battery_level'])
+    elif alert == 'fridge_warning':
+        text = render('fridge_warning_alert', battery=values['battery_level'],
+                      remaining=values['battery_level'] - FRIDGE_ACTIVATION_THRESHOLD,
+                      threshold=FRIDGE_ACTIVATION_THRESHOLD)
+    elif alert == 'battery':
+        arrow = render('battery_up') if values['new_value'] > values['old_value'] else render('battery_down')
+        text = render('battery_alert', arrow=arrow, old_battery=values['old_value'], battery=values['new_value'])
+    else:
+        rule, value = values['rule'], values['value']
+        if values.get('cleared'):
+            text = render('metric_alert_cleared', metric=rule['metric'], value=value)
+        elif 'above' in rule:
+            text = render('metric_alert_above', metric=rule['metric'], value=value, threshold=rule['above'])
+        else:
+            text = render('metric_alert_below', metric=rule['metric'], value=value, threshold=rule['below'])
+    return text.replace("\n", " | ")
+
+
+def replay_main(argv):
+    """python main.py replay FILE [--set NAME=VALUE ...] [--quiet]"""
+    import argparse
+    import ast
+
+    parser = argparse.ArgumentParser(prog="main.py replay", description="Replay recorded readings through the alert logic.")
+    parser.add_argument("file", help="JSON-lines readings file written via RECORD_READINGS")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="Override a threshold, e.g. --set FRIDGE_WARNING_THRESHOLD=70")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary (benchmark mode)")
+    args = parser.parse_args(argv)
+
+    try:
+        overrides = {}
+        for override in args.set:
+            name, _, value = override.partition("=")
+            overrides[name] = ast.literal_eval(value)
+        if overrides:
+            apply_settings(validate_settings(overrides))
+    except (ValueError, SyntaxError) as e:
+        parser.error(str(e))
+
+    def print_alert(now, alert, values):
+        print(f"{now.isoformat()}  {alert:<15} {_alert_text(alert, values)}")
+
+    started = time.perf_counter()
+    with open(args.file) as f:
+        processed, counts = replay_readings(f, None if args.quiet else print_alert)
+    elapsed = time.perf_counter() - started
+
+    rate = processed / elapsed * 60 if elapsed else 0
+    print(f"\nReplayed {processed} readings in {elapsed:.2f}s ({rate:,.0f} readings/min)")
+    for alert, count in sorted(counts.items()):
+        print(f"  {alert:<15} {count}")
+
+
 # ============================== MAIN EXECUTION ============================== #
 def main():
     if not TOKEN:
         print("❌ ERROR: TELEGRAM_TOKEN is not set.")
         return
+    init_dess_api()
     if not dess_api and not LEGACY_API_URL:
         print("⚠️ WARNING: No DessMonitor credentials or API URL configured.")
         print("   Set DESS_USERNAME, DESS_PASSWORD, DESS_COMPANY_KEY in config.py or env vars.")
 
     try:
         print("🚀 Starting the bot...")
-        bot = ApplicationBuilder().token(TOKEN).build()
+        imports_done = time.perf_counter()
+        from telegram.ext import ApplicationBuilder, CommandHandler
+        telegram_done = time.perf_counter()
+        bot = ApplicationBuilder().token(TOKEN).post_init(on_startup).build()
 
         bot.add_handler(CommandHandler("start", start_command))
         bot.add_handler(CommandHandler("battery", battery_command))
         bot.add_handler(CommandHandler("stop", stop_command))
+        bot.add_handler(CommandHandler("chart", chart_command))
         bot.add_handler(CommandHandler("reauth", reauth_command))
         bot.add_handler(CommandHandler("update_api", update_api_command))
+        bot.add_handler(CommandHandler("profile", profile_command))
+
+        startup_ms = (time.perf_counter() - _startup_begin) * 1000
+        print(
+            f"⏱️ Startup {startup_ms:.0f}ms (budget {STARTUP_BUDGET_MS}ms): "
+            f"module {(imports_done - _startup_begin) * 1000:.0f}ms, "
+            f"telegram {(telegram_done - imports_done) * 1000:.0f}ms, "
+            f"app {(time.perf_counter() - telegram_done) * 1000:.0f}ms"
+        )
+        if startup_ms > STARTUP_BUDGET_MS:
+            print(f"⚠️ Startup exceeded its {STARTUP_BUDGET_MS}ms budget")
 
         print("✅ Bot is ready and running...")
         bot.run_polling(drop_pending_updates=True)
@@ -805,4 +2140,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:2] == ["replay"]:
+        replay_main(sys.argv[2:])
+    else:
+        main()